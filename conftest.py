@@ -0,0 +1,32 @@
+# The assistant imports Windows-only and audio packages at module level; stand in
+# for any that are missing so its pure logic can be tested on any machine.
+
+import importlib
+import sys
+import types
+
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+def stub_module(name, **attributes):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, module)
+
+
+stub_module("speech_recognition", Recognizer=_Stub, Microphone=_Stub,
+            WaitTimeoutError=type("WaitTimeoutError", (Exception,), {}))
+stub_module("pyttsx3", init=lambda: None)
+stub_module("win32com")
+stub_module("win32com.client", Dispatch=_Stub)
+stub_module("customtkinter", CTk=_Stub, set_appearance_mode=lambda mode: None,
+            set_default_color_theme=lambda theme: None)
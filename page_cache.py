@@ -0,0 +1,85 @@
+# Helpers for paging app executables and their neighbouring libraries into the
+# OS page cache, so a routine's cold launches are not dominated by disk reads.
+# posix_fadvise(WILLNEED) is used where the platform has it; elsewhere
+# (Windows) the file is read through in chunks, which releases the GIL so the
+# thread pool really reads files in parallel.
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_NEIGHBOURS = 64
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Neighbours here are unrelated system libraries, not the app's own
+SYSTEM_DIRECTORIES = {
+    os.path.normcase(os.path.expandvars(directory))
+    for directory in [r"%SystemRoot%", r"%SystemRoot%\System32", r"%SystemRoot%\SysWOW64",
+                      "/bin", "/sbin", "/usr/bin", "/usr/sbin", "/usr/local/bin"]
+}
+
+
+def is_library(file_name):
+    lower = file_name.lower()
+    return lower.endswith((".dll", ".so", ".dylib")) or ".so." in lower
+
+
+def prewarm_targets(executable):
+    targets = [executable]
+    directory = os.path.dirname(executable)
+    if os.path.normcase(directory) in SYSTEM_DIRECTORIES:
+        return targets
+    try:
+        entries = sorted(os.listdir(directory))
+    except OSError:
+        return targets
+
+    for entry in entries:
+        if len(targets) > MAX_NEIGHBOURS:
+            break
+        path = os.path.join(directory, entry)
+        if is_library(entry) and os.path.isfile(path):
+            targets.append(path)
+    return targets
+
+
+def warm_file(path):
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return 0
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                buffer = bytearray(READ_CHUNK_SIZE)
+                while f.readinto(buffer):
+                    pass
+            return size
+    except OSError:
+        return 0
+
+
+def evict_file(path):
+    # Only used by benchmarks to get a cold start without dropping every cache on the box
+    try:
+        with open(path, 'rb') as f:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except (OSError, AttributeError):
+        pass
+
+
+def collect_targets(executables):
+    targets = []
+    for executable in executables:
+        for path in prewarm_targets(executable):
+            if path not in targets:
+                targets.append(path)
+    return targets
+
+
+def prewarm_files(executables, max_workers=8):
+    targets = collect_targets(executables)
+    if not targets:
+        return 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return sum(pool.map(warm_file, targets))
@@ -0,0 +1,86 @@
+# Cold vs. warm launch benchmark for the routine pre-warm stage (Linux).
+# Before each cold run the executable, its neighbouring libraries and its ldd
+# dependencies are evicted from the page cache with posix_fadvise(DONTNEED);
+# before each warm run they are evicted and then pre-warmed.
+#     python prewarm_bench.py --runs 5 -- git --version
+#
+# DONTNEED cannot drop pages another process has mapped, so libraries this
+# interpreter also uses (libc, libm, ...) stay warm, and benchmarking python
+# itself measures nothing. For a true cold start run as root with
+# --drop-caches, which writes to /proc/sys/vm/drop_caches before every run.
+
+import argparse
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import time
+
+from page_cache import collect_targets, evict_file, prewarm_files, warm_file
+
+LDD_PATTERN = re.compile(r"(/\S+) \(0x")
+
+
+def shared_library_deps(executable):
+    try:
+        output = subprocess.run(["ldd", executable], capture_output=True, text=True).stdout
+    except OSError:
+        return []
+    return [path for path in LDD_PATTERN.findall(output) if os.path.isfile(path)]
+
+
+def make_cold(paths, drop_caches):
+    if drop_caches:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3")
+    else:
+        for path in paths:
+            evict_file(path)
+
+
+def timed_launch(command):
+    start = time.perf_counter()
+    subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark launches with and without pre-warming.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--drop-caches", action="store_true",
+                        help="drop the whole page cache before each run (needs root)")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="command to launch, after --")
+    args = parser.parse_args()
+
+    command = [part for part in args.command if part != "--"]
+    if not command:
+        parser.error("no command given")
+    executable = shutil.which(command[0])
+    if not executable:
+        parser.error(f"{command[0]} not found")
+
+    deps = shared_library_deps(executable)
+    targets = collect_targets([executable]) + deps
+    cold, warm, prewarm_times = [], [], []
+    for _ in range(args.runs):
+        make_cold(targets, args.drop_caches)
+        cold.append(timed_launch(command))
+
+        make_cold(targets, args.drop_caches)
+        start = time.perf_counter()
+        prewarm_files([executable])
+        for path in deps:
+            warm_file(path)
+        prewarm_times.append(time.perf_counter() - start)
+        warm.append(timed_launch(command))
+
+    print(f"Files pre-warmed: {len(targets)} ({len(deps)} from ldd)")
+    print(f"Cold launch:  median {statistics.median(cold) * 1000:.1f} ms")
+    print(f"Pre-warm:     median {statistics.median(prewarm_times) * 1000:.1f} ms")
+    print(f"Warm launch:  median {statistics.median(warm) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# The replay harness drives CompleteSystemController.process_command headlessly
+# with recorded commands, to load-test command dispatch before deploying.
+# Speech output, follow-up listening, app launches and closes are stubbed out,
+# routine pre-warming is turned off, and all writes (learned apps, routines, activity log) go to a temporary directory.
+#
+# Commands come from a JSONL file, one object per line with either a
+# "transcript" string or an "alternatives" n-best list, or are synthesized
+# from the "Opened X" / "Closed X" lines of activity.log:
+#     python replay_harness.py --jsonl transcripts.jsonl --concurrency 8
+#     python replay_harness.py --activity-log activity.log --repeat 20
+#
+# Throughput and latency come from an untraced run; allocation counts come from
+# a second, tracemalloc-traced run over the same commands on a fresh controller.
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from vcl_assistant import CompleteSystemController
+
+
+class SilentEngine:
+    def say(self, text):
+        pass
+
+    def runAndWait(self):
+        pass
+
+
+class HeadlessController(CompleteSystemController):
+    def __init__(self, work_dir, option_reply="one"):
+        super().__init__(engine=SilentEngine())
+        # learned apps and routines are read from the real files, but never written back
+        self.memory_file = os.path.join(work_dir, "app_paths.json")
+        self.routine_file = os.path.join(work_dir, "routines.json")
+        self.activity_log = os.path.join(work_dir, "activity.log")
+        self.option_reply = option_reply
+        # pre-warming reads real executables from disk, which would swamp dispatch latency
+        self.prewarm_routines = False
+        self.launched = []
+        self.closed = []
+
+    def speak(self, text):
+        pass
+
+    def listen(self, n_best=False):
+        return [{"transcript": self.option_reply}] if n_best else self.option_reply
+
+    def is_admin(self):
+        return True
+
+    def run_as_admin(self, command):
+        self.launched.append(command)
+        return True
+
+    def launch(self, path):
+        self.launched.append(path)
+
+    def open_routine_manager(self):
+        pass
+
+    def close_app(self, app_name):
+        self.closed.append(app_name)
+
+
+ACTIVITY_PATTERN = re.compile(r": (Opened|Closed) (.+)$")
+
+
+def load_jsonl(path):
+    commands = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "alternatives" in record:
+                commands.append(record["alternatives"])
+            elif "transcript" in record:
+                commands.append(record["transcript"])
+    return commands
+
+
+def load_activity_log(path):
+    commands = []
+    with open(path, 'r') as f:
+        for line in f:
+            match = ACTIVITY_PATTERN.search(line.strip())
+            if match:
+                verb = "open" if match.group(1) == "Opened" else "close"
+                commands.append(f"{verb} {match.group(2)}")
+    return commands
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = round(pct / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def run_commands(controller, commands, concurrency):
+    latencies = []
+    errors = {}
+    lock = threading.Lock()
+
+    def dispatch(command):
+        start = time.perf_counter()
+        try:
+            if isinstance(command, list):
+                command = controller.choose_command(command)
+            controller.process_command(command)
+        except Exception as e:
+            with lock:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(dispatch, commands))
+    return time.perf_counter() - start, latencies, errors
+
+
+def replay(controller, commands, concurrency=1):
+    wall_time, latencies, errors = run_commands(controller, commands, concurrency)
+    return {
+        "commands": len(commands),
+        "concurrency": concurrency,
+        "launches": len(controller.launched),
+        "closes": len(controller.closed),
+        "errors": errors,
+        "wall_time_s": wall_time,
+        "throughput_per_s": len(commands) / wall_time if wall_time else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000
+        }
+    }
+
+
+def measure_allocations(controller, commands, concurrency=1, top=5):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    run_commands(controller, commands, concurrency)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")
+    return {
+        "new_blocks": sum(stat.count_diff for stat in stats),
+        "new_kib": sum(stat.size_diff for stat in stats) / 1024,
+        "peak_kib": peak / 1024,
+        "top_sites": [
+            f"{stat.traceback}: {stat.count_diff} blocks, {stat.size_diff / 1024:.1f} KiB"
+            for stat in sorted(stats, key=lambda s: s.size_diff, reverse=True)[:top]
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay voice commands through process_command.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jsonl", help="JSONL file of transcripts or n-best alternatives")
+    source.add_argument("--activity-log", help="activity.log to synthesize open/close commands from")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="replay the command list this many times")
+    parser.add_argument("--option-reply", default="one", help="answer given when asked to pick a match")
+    parser.add_argument("--top", type=int, default=5, help="number of allocation sites to report")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the traced allocation pass")
+    args = parser.parse_args()
+
+    commands = load_jsonl(args.jsonl) if args.jsonl else load_activity_log(args.activity_log)
+    if not commands:
+        parser.error("no commands to replay")
+    commands = commands * args.repeat
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        controller = HeadlessController(work_dir, option_reply=args.option_reply)
+        report = replay(controller, commands, concurrency=args.concurrency)
+
+    if not args.no_allocations:
+        with tempfile.TemporaryDirectory() as work_dir:
+            controller = HeadlessController(work_dir, option_reply=args.option_reply)
+            report["allocations"] = measure_allocations(controller, commands,
+                                                        concurrency=args.concurrency, top=args.top)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
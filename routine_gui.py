@@ -4,23 +4,51 @@
 import os
 import json
 import subprocess
+import threading
 import ctypes
 import win32com.client
 from tkinter import messagebox
 import customtkinter
 from tkinter import ttk
+from page_cache import prewarm_files
 
 # Set appearance (dark theme with default blue color)
 customtkinter.set_appearance_mode("Dark")
 customtkinter.set_default_color_theme("blue")
 
+
+def get_start_menu_shortcuts():
+    # Fetch all .lnk shortcuts from system and user start menu, keyed by display name
+    start_menu_dirs = [
+        os.path.join(os.environ.get("PROGRAMDATA", ""), r"Microsoft\Windows\Start Menu\Programs"),
+        os.path.join(os.environ.get("APPDATA", ""), r"Microsoft\Windows\Start Menu\Programs"),
+    ]
+
+    app_dict = {}
+
+    for start_dir in start_menu_dirs:
+        for root, _, files in os.walk(start_dir):
+            for file in files:
+                if file.endswith(".lnk"):
+                    full_path = os.path.join(root, file)
+                    try:
+                        shell = win32com.client.Dispatch("WScript.Shell")
+                        shortcut = shell.CreateShortCut(full_path)
+                        target_path = shortcut.Targetpath
+                        if target_path and os.path.exists(target_path):
+                            app_name = os.path.splitext(file)[0]
+                            app_dict[app_name] = target_path
+                    except Exception:
+                        continue
+    return dict(sorted(app_dict.items()))  # sort alphabetically
+
 class RoutineManagerGUI(customtkinter.CTk):
     def __init__(self):
         super().__init__()
         self.title("App Launch Routines Manager")
         self.geometry("800x600")
 
-        self.available_apps = self.get_start_menu_shortcuts()
+        self.available_apps = get_start_menu_shortcuts()
 
         # Path to routines JSON file
         self.routines_file = os.path.join(os.getcwd(), "routines.json")
@@ -59,6 +87,9 @@ class RoutineManagerGUI(customtkinter.CTk):
         self.run_button.pack(pady=5)
         self.delete_button = customtkinter.CTkButton(right_frame, text="Delete Routine", command=self.delete_selected_routine, state="disabled")
         self.delete_button.pack(pady=5)
+        self.prewarm_check = customtkinter.CTkCheckBox(right_frame, text="Pre-warm apps")
+        self.prewarm_check.select()
+        self.prewarm_check.pack(pady=5)
         self.close_button = customtkinter.CTkButton(right_frame, text="Close", command=self.destroy)
         self.close_button.pack(pady=5)
         
@@ -273,6 +304,26 @@ class RoutineManagerGUI(customtkinter.CTk):
                 self.load_treeview_data()
                 self.log(f"Routine '{routine_name}' deleted.")
 
+    def prewarm_routine(self, routine_name, apps):
+        # Page the routine's executables into the OS cache off the UI thread, then launch
+        paths = []
+        for app_info in apps:
+            path = app_info.get("app") or self.available_apps.get(app_info.get("name", ""))
+            if path and os.path.isfile(path):
+                paths.append(path)
+        self.log(f"Pre-warming {len(paths)} apps for '{routine_name}'...")
+        self.run_button.configure(state="disabled")
+        worker = threading.Thread(target=prewarm_files, args=(paths,), daemon=True)
+        worker.start()
+        self.after(50, self.wait_for_prewarm, worker, routine_name, apps)
+
+    def wait_for_prewarm(self, worker, routine_name, apps):
+        if worker.is_alive():
+            self.after(50, self.wait_for_prewarm, worker, routine_name, apps)
+            return
+        self.run_button.configure(state="normal")
+        self.launch_routine(routine_name, apps)
+
     def run_selected_routine(self):
         selected = self.tree.selection()
         if not selected:
@@ -283,6 +334,12 @@ class RoutineManagerGUI(customtkinter.CTk):
             sel = parent
         routine_name = self.tree.item(sel, "text")
         apps = self.routines.get(routine_name, [])
+        if self.prewarm_check.get():
+            self.prewarm_routine(routine_name, apps)
+        else:
+            self.launch_routine(routine_name, apps)
+
+    def launch_routine(self, routine_name, apps):
         self.log(f"Running routine '{routine_name}'...")
         for app_info in apps:
             app = app_info.get("app")
@@ -299,31 +356,6 @@ class RoutineManagerGUI(customtkinter.CTk):
             except Exception as e:
                 self.log(f" Error launching {app}: {e}")
 
-    def get_start_menu_shortcuts(self):
-        # Fetch all .lnk shortcuts from system and user start menu
-        start_menu_dirs = [
-            os.path.join(os.environ["PROGRAMDATA"], r"Microsoft\Windows\Start Menu\Programs"),
-            os.path.join(os.environ["APPDATA"], r"Microsoft\Windows\Start Menu\Programs"),
-        ]
-
-        app_dict = {}
-
-        for start_dir in start_menu_dirs:
-            for root, _, files in os.walk(start_dir):
-                for file in files:
-                    if file.endswith(".lnk"):
-                        full_path = os.path.join(root, file)
-                        try:
-                            shell = win32com.client.Dispatch("WScript.Shell")
-                            shortcut = shell.CreateShortCut(full_path)
-                            target_path = shortcut.Targetpath
-                            if target_path and os.path.exists(target_path):
-                                app_name = os.path.splitext(file)[0]
-                                app_dict[app_name] = target_path
-                        except Exception:
-                            continue
-        return dict(sorted(app_dict.items()))  # sort alphabetically
-
 
     def log(self, message):
         # Append message to log textbox
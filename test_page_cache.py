@@ -0,0 +1,57 @@
+import os
+
+import page_cache
+
+
+def test_is_library():
+    assert page_cache.is_library("Qt5Core.DLL")
+    assert page_cache.is_library("libz.so")
+    assert page_cache.is_library("libz.so.1")
+    assert page_cache.is_library("libfoo.dylib")
+    assert not page_cache.is_library("app.exe")
+    assert not page_cache.is_library("sonar.txt")
+
+
+def test_prewarm_targets_include_neighbouring_libraries(tmp_path):
+    (tmp_path / "app.exe").touch()
+    (tmp_path / "core.dll").touch()
+    (tmp_path / "readme.txt").touch()
+    targets = page_cache.prewarm_targets(str(tmp_path / "app.exe"))
+    assert targets == [str(tmp_path / "app.exe"), str(tmp_path / "core.dll")]
+
+
+def test_prewarm_targets_skip_system_directories(tmp_path, monkeypatch):
+    (tmp_path / "cmd.exe").touch()
+    (tmp_path / "advapi32.dll").touch()
+    monkeypatch.setattr(page_cache, "SYSTEM_DIRECTORIES", {os.path.normcase(str(tmp_path))})
+    assert page_cache.prewarm_targets(str(tmp_path / "cmd.exe")) == [str(tmp_path / "cmd.exe")]
+
+
+def test_prewarm_targets_cap_neighbours(tmp_path, monkeypatch):
+    (tmp_path / "app.exe").touch()
+    for index in range(5):
+        (tmp_path / f"lib{index}.dll").touch()
+    monkeypatch.setattr(page_cache, "MAX_NEIGHBOURS", 2)
+    targets = page_cache.prewarm_targets(str(tmp_path / "app.exe"))
+    assert targets == [str(tmp_path / "app.exe"), str(tmp_path / "lib0.dll"), str(tmp_path / "lib1.dll")]
+
+
+def test_collect_targets_removes_duplicates(tmp_path):
+    (tmp_path / "a.exe").touch()
+    (tmp_path / "b.exe").touch()
+    (tmp_path / "shared.dll").touch()
+    targets = page_cache.collect_targets([str(tmp_path / "a.exe"), str(tmp_path / "b.exe")])
+    assert targets == [str(tmp_path / "a.exe"), str(tmp_path / "shared.dll"), str(tmp_path / "b.exe")]
+
+
+def test_warm_file_reads_through_without_fadvise(tmp_path, monkeypatch):
+    (tmp_path / "app.exe").write_bytes(b"x" * (page_cache.READ_CHUNK_SIZE + 10))
+    monkeypatch.delattr(os, "posix_fadvise", raising=False)
+    assert page_cache.warm_file(str(tmp_path / "app.exe")) == page_cache.READ_CHUNK_SIZE + 10
+
+
+def test_prewarm_files_sums_sizes_and_ignores_missing(tmp_path):
+    (tmp_path / "app.exe").write_bytes(b"x" * 100)
+    (tmp_path / "core.dll").write_bytes(b"x" * 50)
+    total = page_cache.prewarm_files([str(tmp_path / "app.exe"), str(tmp_path / "gone.exe")])
+    assert total == 150
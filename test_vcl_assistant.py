@@ -0,0 +1,206 @@
+import os
+import time
+
+import pytest
+
+import vcl_assistant
+
+
+class SilentEngine:
+    def say(self, text):
+        pass
+
+    def runAndWait(self):
+        pass
+
+
+@pytest.fixture
+def search_root(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def controller(tmp_path, search_root):
+    controller = vcl_assistant.CompleteSystemController(engine=SilentEngine())
+    controller.memory_file = str(tmp_path / "app_paths.json")
+    controller.activity_log = str(tmp_path / "activity.log")
+    controller.search_paths = [str(search_root)]
+    controller.revalidate_batch_delay = 0
+    controller.learned_apps = {
+        "teams": {"path": "msteams.exe"},
+        "chrome": {"path": "chrome.exe"}
+    }
+    return controller
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    launched = []
+    monkeypatch.setattr(vcl_assistant.os, "startfile", launched.append, raising=False)
+    return launched
+
+
+def test_misrecognized_app_loses_to_known_app(controller):
+    alternatives = [
+        {"transcript": "open tims", "confidence": 0.9},
+        {"transcript": "open teams"}
+    ]
+    assert controller.choose_command(alternatives) == "open teams"
+
+
+def test_top_close_command_is_not_replaced_by_open(controller):
+    alternatives = [
+        {"transcript": "close chrome", "confidence": 0.9},
+        {"transcript": "open chrome"}
+    ]
+    assert controller.choose_command(alternatives) == "close chrome"
+
+
+def test_top_exit_command_is_kept(controller):
+    alternatives = [
+        {"transcript": "stop", "confidence": 0.8},
+        {"transcript": "open teams"}
+    ]
+    assert controller.choose_command(alternatives) == "stop"
+
+
+def test_unrecognized_top_is_replaced_by_open(controller):
+    alternatives = [
+        {"transcript": "oven chrome", "confidence": 0.8},
+        {"transcript": "open chrome"}
+    ]
+    assert controller.choose_command(alternatives) == "open chrome"
+
+
+def test_top_known_app_is_kept(controller):
+    alternatives = [
+        {"transcript": "open chrome", "confidence": 0.9},
+        {"transcript": "open crown"}
+    ]
+    assert controller.choose_command(alternatives) == "open chrome"
+
+
+def test_unrecognized_top_is_not_replaced_by_exit_or_close(controller):
+    alternatives = [
+        {"transcript": "oven chrome", "confidence": 0.8},
+        {"transcript": "stop chrome"},
+        {"transcript": "close chrome"},
+        {"transcript": "open chrome"}
+    ]
+    assert controller.choose_command(alternatives) == "open chrome"
+
+
+def test_unrecognized_top_is_kept_without_a_known_open_alternative(controller):
+    alternatives = [
+        {"transcript": "oven chrome", "confidence": 0.8},
+        {"transcript": "stop chrome"},
+        {"transcript": "open zzyzx"}
+    ]
+    assert controller.choose_command(alternatives) == "oven chrome"
+
+
+def test_no_alternatives(controller):
+    assert controller.choose_command([]) == ""
+
+
+def test_missing_app_is_cached(controller):
+    assert controller.find_app_path("zzyzx") == (None, False)
+    assert controller.is_known_missing("zzyzx")
+
+
+def test_missing_app_expires_after_ttl(controller):
+    controller.find_app_path("zzyzx")
+    missed_at, signature = controller.missing_apps["zzyzx"]
+    controller.missing_apps["zzyzx"] = (missed_at - controller.negative_cache_ttl - 1, signature)
+    assert not controller.is_known_missing("zzyzx")
+
+
+def test_missing_app_is_forgotten_when_search_root_changes(controller, search_root):
+    controller.find_app_path("zzyzx")
+    changed = time.time() + 10
+    os.utime(search_root, (changed, changed))
+    assert not controller.is_known_missing("zzyzx")
+
+
+def test_revalidate_repairs_path_in_same_named_directory(controller, tmp_path, search_root):
+    (search_root / "Vendor").mkdir()
+    (search_root / "Vendor" / "app.exe").touch()
+    controller.learned_apps["app"] = {"path": str(tmp_path / "gone" / "Vendor" / "app.exe")}
+    controller.revalidate_learned_apps()
+    assert controller.learned_apps["app"]["path"] == str(search_root / "Vendor" / "app.exe")
+
+
+def test_revalidate_repairs_shortcut_with_same_name(controller, tmp_path, search_root):
+    (search_root / "App.lnk").touch()
+    controller.learned_apps["app"] = {"path": str(tmp_path / "old" / "App.lnk")}
+    controller.revalidate_learned_apps()
+    assert controller.learned_apps["app"]["path"] == str(search_root / "App.lnk")
+
+
+def test_revalidate_prunes_generic_name_from_another_app(controller, tmp_path, search_root):
+    (search_root / "Other").mkdir()
+    (search_root / "Other" / "setup.exe").touch()
+    controller.learned_apps["mine"] = {"path": str(tmp_path / "gone" / "Mine" / "setup.exe")}
+    controller.revalidate_learned_apps()
+    assert "mine" not in controller.learned_apps
+    assert "chrome" in controller.learned_apps
+
+
+def test_dead_learned_path_is_searched_again(controller, tmp_path, search_root, launched):
+    (search_root / "foo.exe").touch()
+    controller.learned_apps["foo"] = {"path": str(tmp_path / "gone" / "foo.exe")}
+    assert controller.open_app("foo")
+    assert launched == [str(search_root / "foo.exe")]
+    assert controller.learned_apps["foo"]["path"] == str(search_root / "foo.exe")
+
+
+def test_bookkeeping_failure_does_not_relaunch(controller, tmp_path, search_root, launched):
+    (search_root / "foo.exe").touch()
+    controller.learned_apps["foo"] = {"path": str(search_root / "foo.exe")}
+    controller.activity_log = str(tmp_path)
+    assert controller.open_app("foo")
+    assert launched == [str(search_root / "foo.exe")]
+
+
+def test_permission_error_keeps_learned_entry(controller, search_root, monkeypatch):
+    def denied(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(vcl_assistant.os, "startfile", denied, raising=False)
+    (search_root / "foo.exe").touch()
+    controller.learned_apps["foo"] = {"path": str(search_root / "foo.exe")}
+    assert not controller.open_app("foo")
+    assert "foo" in controller.learned_apps
+
+
+def test_run_routine_matches_name_case_insensitively(controller, search_root, launched):
+    (search_root / "app.exe").touch()
+    controller.routines = {"Morning": [{"app": str(search_root / "app.exe"), "admin": False}]}
+    controller.prewarm_routines = False
+    controller.process_command("run routine morning")
+    assert launched == [str(search_root / "app.exe")]
+
+
+def test_run_routines_is_not_parsed_as_a_routine_name(controller, search_root, launched):
+    (search_root / "app.exe").touch()
+    controller.routines = {"s x": [{"app": str(search_root / "app.exe"), "admin": False}]}
+    controller.prewarm_routines = False
+    controller.process_command("run routines x")
+    assert launched == []
+
+
+def test_routine_apps_resolve_through_start_menu_names(controller, search_root):
+    (search_root / "Code.exe").touch()
+    (search_root / "tool.exe").touch()
+    controller.start_menu_apps = {"visual studio code": str(search_root / "Code.exe")}
+    controller.routines = {"Dev": [
+        {"name": "Visual Studio Code", "admin": False},
+        {"app": str(search_root / "tool.exe"), "admin": False},
+        {"name": "Unknown App", "admin": False}
+    ]}
+    assert controller.resolve_routine_executables("dev") == [
+        str(search_root / "Code.exe"),
+        str(search_root / "tool.exe")
+    ]
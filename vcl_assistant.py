@@ -7,18 +7,29 @@ from datetime import datetime
 import ctypes
 import sys
 import difflib
+import re
+import shutil
+import threading
+import time
 import win32com.client
-from routine_gui import RoutineManagerGUI
+from routine_gui import RoutineManagerGUI, get_start_menu_shortcuts
+from page_cache import prewarm_files
+
+FUZZY_CUTOFF = 0.7
+EXIT_WORDS = ["exit", "quit", "close assistant", "stop"]
 
 
 class CompleteSystemController:
-    def __init__(self):
-        self.engine = pyttsx3.init()
+    def __init__(self, engine=None):
+        self.engine = engine or pyttsx3.init()
         self.r = sr.Recognizer()
         self.memory_file = "app_paths.json"
+        self.activity_log = "activity.log"
         self.learned_apps = self.load_memory()
         self.routine_file = "routines.json"
         self.routines = self.load_routines()
+        self.prewarm_routines = True
+        self.start_menu_apps = None
 
         self.system_commands = {
             "file explorer": ("explorer.exe", False),
@@ -29,6 +40,23 @@ class CompleteSystemController:
             "notepad": ("notepad.exe", False),
             "registry": ("regedit.exe", True)
         }
+
+        self.search_paths = [
+            r"C:\\ProgramData\\Microsoft\\Windows\\Start Menu\\Programs",
+            os.path.expandvars(r"%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs"),
+            os.path.expandvars(r"%USERPROFILE%\\Desktop"),
+            os.path.expandvars(r"%PROGRAMFILES%"),
+            os.path.expandvars(r"%PROGRAMFILES(X86)%"),
+            os.path.expandvars(r"%LOCALAPPDATA%")
+        ]
+
+        self.memory_lock = threading.Lock()
+        self.missing_apps = {}
+        self.negative_cache_ttl = 300
+        self.revalidator = None
+        self.revalidate_interval = 600
+        self.revalidate_batch_size = 10
+        self.revalidate_batch_delay = 1
     
     def load_routines(self):
         try:
@@ -69,15 +97,78 @@ class CompleteSystemController:
             for name in self.routines:
                 print(f"- {name}")
 
-    def run_routine(self, name):
-        routine = self.routines.get(name)
+    def find_start_menu_target(self, app_name):
+        # routines created in the GUI name apps by their Start Menu display name
+        if self.start_menu_apps is None:
+            self.start_menu_apps = {name.lower(): target for name, target in get_start_menu_shortcuts().items()}
+        return self.start_menu_apps.get(app_name.lower())
+
+    def resolve_executable(self, app_name):
+        # Paths, known apps and Start Menu names are resolved without the full search or a prompt
+        all_known = list(self.learned_apps.keys()) + list(self.system_commands.keys())
+        if os.path.isabs(app_name):
+            path = app_name
+        else:
+            known_name = self.fuzzy_match(app_name.lower(), all_known)
+            if known_name in self.system_commands:
+                path = self.system_commands[known_name][0]
+            elif known_name in self.learned_apps:
+                path = self.learned_apps[known_name]["path"]
+            else:
+                path = self.find_start_menu_target(app_name)
+                if not path:
+                    return None
+
+        if path.lower().endswith(".lnk"):
+            try:
+                shell = win32com.client.Dispatch("WScript.Shell")
+                path = shell.CreateShortCut(path).Targetpath
+            except Exception:
+                return None
+        elif not os.path.isabs(path):
+            path = shutil.which(path)
+        return path if path and os.path.isfile(path) else None
+
+    def find_routine_name(self, name):
+        # commands arrive lowercased, but the GUI keeps the case routines were saved with
+        for routine_name in self.routines:
+            if routine_name.lower() == name.lower():
+                return routine_name
+        return None
+
+    def resolve_routine_executables(self, name):
+        executables = []
+        for app in self.routines.get(self.find_routine_name(name), []):
+            # routines saved by the GUI store the target path under "app"
+            path = self.resolve_executable(app.get("name") or app.get("app", ""))
+            if path:
+                executables.append(path)
+        return executables
+
+    def prewarm_routine(self, name):
+        return prewarm_files(self.resolve_routine_executables(name))
+
+    def schedule_prewarm(self, name, run_at, lead_seconds=120):
+        # Resolve now, on the calling thread, since shortcut lookups go through COM
+        executables = self.resolve_routine_executables(name)
+        delay = max(0, (run_at - datetime.now()).total_seconds() - lead_seconds)
+        timer = threading.Timer(delay, prewarm_files, args=(executables,))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def run_routine(self, name, prewarm=False):
+        routine = self.routines.get(self.find_routine_name(name))
         if not routine:
             self.speak(f"No routine named {name} found.")
             return
 
+        if prewarm:
+            self.prewarm_routine(name)
+
         self.speak(f"Starting routine: {name}")
         for app in routine:
-            self.open_app(app["name"], admin=app["admin"])
+            self.open_app(app.get("name") or app.get("app", ""), admin=app.get("admin", False))
 
 
     def load_memory(self):
@@ -96,18 +187,80 @@ class CompleteSystemController:
         self.engine.say(text)
         self.engine.runAndWait()
 
-    def listen(self):
+    def listen(self, n_best=False):
         with sr.Microphone() as source:
             print("\n[Listening...]")
             try:
                 audio = self.r.listen(source, timeout=3)
+                if n_best:
+                    result = self.r.recognize_google(audio, show_all=True)
+                    return result.get("alternative", []) if isinstance(result, dict) else []
                 return self.r.recognize_google(audio).lower()
             except sr.WaitTimeoutError:
                 self.speak("Listening timed out, please try again.")
-                return ""
+                return [] if n_best else ""
             except Exception as e:
                 print(f"Recognition error: {e}")
-                return ""
+                return [] if n_best else ""
+
+    def match_score(self, command, known_names):
+        clean_command = command.replace(" as admin", "").replace("administrator", "").strip()
+        if "open routines" in clean_command or "routine manager" in clean_command:
+            return 1.0
+
+        app_name = clean_command.replace("open", "").strip()
+        if not app_name:
+            return 0.0
+        if app_name in known_names:
+            return 1.0
+        return max((difflib.SequenceMatcher(None, app_name, name).ratio() for name in known_names), default=0.0)
+
+    def command_verb(self, command):
+        if any(word in command for word in EXIT_WORDS):
+            return "exit"
+        for verb in ["add path", "run routine", "start routine", "open", "close"]:
+            if verb in command:
+                return verb
+        return None
+
+    def hypothesis_key(self, hypothesis, known_names):
+        transcript, confidence = hypothesis
+        verb = self.command_verb(transcript)
+        if verb is None:
+            return (False, 0.0)
+        if verb != "open":
+            return (True, confidence)
+
+        # an app that resolves without a disk walk outranks any that doesn't
+        score = self.match_score(transcript, known_names)
+        return (score >= FUZZY_CUTOFF, confidence * score)
+
+    def choose_command(self, alternatives):
+        # alternatives is the n-best list from recognize_google(show_all=True);
+        # only the top entry usually carries a confidence, so rank stands in for the rest
+        hypotheses = []
+        for rank, alternative in enumerate(alternatives):
+            transcript = alternative.get("transcript", "").lower().strip()
+            if transcript:
+                hypotheses.append((transcript, alternative.get("confidence", 1.0 / (rank + 1))))
+
+        if not hypotheses:
+            return ""
+
+        known_names = list(self.learned_apps.keys()) + list(self.system_commands.keys())
+
+        # a recognized top command is only ever replaced by an alternative with the same verb,
+        # and an unrecognized one only by an open command naming a known app, never by close or exit
+        top_verb = self.command_verb(hypotheses[0][0])
+        if top_verb:
+            hypotheses = [h for h in hypotheses if self.command_verb(h[0]) == top_verb]
+        else:
+            hypotheses = [hypotheses[0]] + [
+                h for h in hypotheses[1:]
+                if self.command_verb(h[0]) == "open" and self.match_score(h[0], known_names) >= FUZZY_CUTOFF
+            ]
+
+        return max(hypotheses, key=lambda h: self.hypothesis_key(h, known_names))[0]
 
     def is_admin(self):
         try:
@@ -124,7 +277,7 @@ class CompleteSystemController:
             return False
 
     def fuzzy_match(self, app_name, known_names):
-        match = difflib.get_close_matches(app_name, known_names, n=1, cutoff=0.7)
+        match = difflib.get_close_matches(app_name, known_names, n=1, cutoff=FUZZY_CUTOFF)
         return match[0] if match else app_name
 
     def resolve_shortcut_name(self, shortcut_path):
@@ -133,28 +286,107 @@ class CompleteSystemController:
         except:
             return None
 
+    def get_search_roots_signature(self):
+        signature = []
+        for base_path in self.search_paths:
+            try:
+                signature.append((base_path, os.stat(base_path).st_mtime))
+            except OSError:
+                signature.append((base_path, None))
+        return tuple(signature)
+
+    def is_known_missing(self, app_name):
+        entry = self.missing_apps.get(app_name)
+        if not entry:
+            return False
+
+        missed_at, signature = entry
+        if (time.time() - missed_at > self.negative_cache_ttl
+                or signature != self.get_search_roots_signature()):
+            self.missing_apps.pop(app_name, None)
+            return False
+        return True
+
+    def find_replacement_paths(self, dead_paths):
+        # One walk per batch; a file only counts as the same app if it is a shortcut
+        # with the same name or sits in a directory with the same name, so generic
+        # names like setup.exe or Update.exe are not repaired to some other app
+        wanted = {os.path.basename(path).lower() for path in dead_paths}
+        found = {}
+        for base_path in self.search_paths:
+            for root, _, files in os.walk(base_path):
+                for file in files:
+                    if file.lower() in wanted:
+                        found.setdefault(file.lower(), []).append(os.path.join(root, file))
+
+        replacements = {}
+        for dead_path in dead_paths:
+            file_name = os.path.basename(dead_path).lower()
+            dir_name = os.path.basename(os.path.dirname(dead_path)).lower()
+            for candidate in found.get(file_name, []):
+                if (file_name.endswith(".lnk")
+                        or os.path.basename(os.path.dirname(candidate)).lower() == dir_name):
+                    replacements[dead_path] = candidate
+                    break
+        return replacements
+
+    def revalidate_learned_apps(self):
+        names = list(self.learned_apps.keys())
+        for start in range(0, len(names), self.revalidate_batch_size):
+            dead = {}
+            for name in names[start:start + self.revalidate_batch_size]:
+                entry = self.learned_apps.get(name)
+                # bare names like "chrome.exe" are resolved by the shell, not the filesystem
+                if entry and os.path.isabs(entry["path"]) and not os.path.exists(entry["path"]):
+                    dead[name] = entry["path"]
+
+            if dead:
+                replacements = self.find_replacement_paths(list(dead.values()))
+                with self.memory_lock:
+                    for name, old_path in dead.items():
+                        if self.learned_apps.get(name, {}).get("path") != old_path:
+                            continue
+                        if old_path in replacements:
+                            self.learned_apps[name]["path"] = replacements[old_path]
+                        else:
+                            del self.learned_apps[name]
+                    self.save_memory()
+
+            time.sleep(self.revalidate_batch_delay)
+
+    def revalidate_loop(self):
+        while True:
+            try:
+                self.revalidate_learned_apps()
+            except Exception as e:
+                print(f"Revalidation error: {e}")
+            time.sleep(self.revalidate_interval)
+
+    def start_revalidator(self):
+        if self.revalidator and self.revalidator.is_alive():
+            return
+        self.revalidator = threading.Thread(target=self.revalidate_loop, daemon=True)
+        self.revalidator.start()
+
     def find_app_path(self, app_name):
         app_name_lower = app_name.lower()
 
         if app_name_lower in self.system_commands:
             return self.system_commands[app_name_lower]
 
-        if app_name_lower in self.learned_apps:
-            path = self.learned_apps[app_name_lower]["path"]
-            if os.path.exists(path):
-                return (path, self.learned_apps[app_name_lower].get("requires_admin", False))
+        if os.path.isabs(app_name) and os.path.exists(app_name):
+            return (app_name, False)
 
-        search_paths = [
-            r"C:\\ProgramData\\Microsoft\\Windows\\Start Menu\\Programs",
-            os.path.expandvars(r"%APPDATA%\\Microsoft\\Windows\\Start Menu\\Programs"),
-            os.path.expandvars(r"%USERPROFILE%\\Desktop"),
-            os.path.expandvars(r"%PROGRAMFILES%"),
-            os.path.expandvars(r"%PROGRAMFILES(X86)%"),
-            os.path.expandvars(r"%LOCALAPPDATA%")
-        ]
+        # learned paths are kept valid by the background revalidator
+        learned = self.learned_apps.get(app_name_lower)
+        if learned:
+            return (learned["path"], learned.get("requires_admin", False))
+
+        if self.is_known_missing(app_name_lower):
+            return (None, False)
 
         matches = []
-        for base_path in search_paths:
+        for base_path in self.search_paths:
             for root, _, files in os.walk(base_path):
                 for file in files:
                     if file.lower().endswith(('.lnk', '.exe')):
@@ -163,6 +395,7 @@ class CompleteSystemController:
                             matches.append(os.path.join(root, file))
 
         if not matches:
+            self.missing_apps[app_name_lower] = (time.time(), self.get_search_roots_signature())
             return (None, False)
 
         matches = sorted(matches, key=lambda m: 0 if m.endswith('.lnk') else 1)
@@ -195,6 +428,15 @@ class CompleteSystemController:
         self.speak("I couldn't understand the option number. Please try again.")
         return (None, False)
 
+    def launch(self, path):
+        # learned paths are not checked on lookup, so a dead one has to fail here
+        if os.path.isabs(path) and not os.path.exists(path):
+            raise FileNotFoundError(path)
+        if path.lower().endswith((".exe", ".lnk")):
+            os.startfile(path)
+        else:
+            subprocess.Popen(path, shell=True)
+
     def open_app(self, app_name, admin=False):
         all_known = list(self.learned_apps.keys()) + list(self.system_commands.keys())
         app_name = self.fuzzy_match(app_name, all_known)
@@ -212,28 +454,56 @@ class CompleteSystemController:
                     self.speak(f"Attempting to open {app_name} as administrator")
                     return self.run_as_admin(path)
 
-            if path.endswith(".exe"):
-                os.startfile(path)
-            else:
-                subprocess.Popen(path, shell=True)
-
-            self.speak(f"Opened {app_name}" + (" as administrator" if admin else ""))
+            self.launch(path)
+        except FileNotFoundError as e:
+            with self.memory_lock:
+                stale = self.learned_apps.get(app_name, {}).get("path") == path
+                if stale:
+                    del self.learned_apps[app_name]
+            if not stale:
+                self.speak(f"Failed to open {app_name}: {str(e)}")
+                return False
+            try:
+                with self.memory_lock:
+                    self.save_memory()
+            except Exception as save_error:
+                print(f"Failed to save learned apps: {save_error}")
+            # search the disk again now that the dead learned path is gone
+            return self.open_app(app_name, admin)
+        except Exception as e:
+            self.speak(f"Failed to open {app_name}: {str(e)}")
+            return False
 
-            if app_name not in self.system_commands:
-                self.learned_apps[app_name] = {
-                    "path": path,
-                    "requires_admin": requires_admin or admin,
-                    "last_used": str(datetime.now())
-                }
-                self.save_memory()
+        self.speak(f"Opened {app_name}" + (" as administrator" if admin else ""))
 
-            with open("activity.log", "a") as log:
+        try:
+            if app_name not in self.system_commands and not os.path.isabs(app_name):
+                with self.memory_lock:
+                    self.learned_apps[app_name] = {
+                        "path": path,
+                        "requires_admin": requires_admin or admin,
+                        "last_used": str(datetime.now())
+                    }
+                    self.save_memory()
+                self.missing_apps.pop(app_name, None)
+
+            with open(self.activity_log, "a") as log:
                 log.write(f"{datetime.now()}: Opened {app_name}\n")
+        except Exception as e:
+            # the app is already running, so a bookkeeping failure must not retry the launch
+            print(f"Failed to record {app_name}: {e}")
 
-            return True
+        return True
+
+    def open_routine_manager(self):
+        try:
+            from routine_gui import RoutineManagerGUI
+            self.speak("Opening routine manager.")
+            gui = RoutineManagerGUI()
+            gui.mainloop()
         except Exception as e:
-            self.speak(f"Failed to open {app_name}: {str(e)}")
-            return False
+            self.speak("Failed to open routine manager.")
+            print(f"GUI error: {e}")
 
     def process_command(self, command):
         command = command.lower()
@@ -245,14 +515,12 @@ class CompleteSystemController:
             return
 
         if "open routines" in clean_command or "routine manager" in clean_command:
-            try:
-                from routine_gui import RoutineManagerGUI
-                self.speak("Opening routine manager.")
-                gui = RoutineManagerGUI()
-                gui.mainloop()
-            except Exception as e:
-                self.speak("Failed to open routine manager.")
-                print(f"GUI error: {e}")
+            self.open_routine_manager()
+            return
+
+        routine_match = re.search(r"\b(?:run|start) routine\s+(.+)", clean_command)
+        if routine_match:
+            self.run_routine(routine_match.group(1).strip(), prewarm=self.prewarm_routines)
             return
 
         if "open" in clean_command:
@@ -267,12 +535,13 @@ class CompleteSystemController:
             self.speak("Command not recognized")
 
     def run(self):
+        self.start_revalidator()
         self.speak("System controller ready")
         while True:
-            cmd = self.listen()
+            cmd = self.choose_command(self.listen(n_best=True))
             if cmd:
                 print(f"USER: {cmd}")
-                if any(word in cmd for word in ["exit", "quit", "close assistant", "stop"]):
+                if any(word in cmd for word in EXIT_WORDS):
                     self.speak("Goodbye!")
                     break
                 self.process_command(cmd)